@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 import pandas as pd
 import pg8000
@@ -6,17 +6,31 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime
 import io 
+import time
 from sqlalchemy import create_engine
 import json
 from supabase import create_client, Client
 import re
+import secrets
+from contextlib import asynccontextmanager
 import logfire
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the raw schema and ingestion catalog once, before serving requests"""
+    try:
+        ensure_raw_schema()
+    except HTTPException as e:
+        # Requests that need the catalog retry it, so a database outage at boot
+        # does not keep the app down
+        logfire.error("Raw schema setup failed at startup", error=e.detail)
+    yield
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 logfire.configure(token=os.getenv("LOGFIRE_TOKEN"))
 logfire.instrument_fastapi(app)
@@ -53,6 +67,246 @@ def sanitize_string(input_string: str, to_lowercase: bool = True) -> str:
     result = sanitized.lower() if to_lowercase else sanitized
     return result
 
+# Postgres silently truncates identifiers longer than this
+MAX_IDENTIFIER_LENGTH = 63
+
+# Tokens treated as missing values. A value is a null token when, lowercased
+# (and trimmed when trimming is on), it equals one of these
+NULL_TOKENS = ["", "na", "n/a", "nan", "null", "none", "nil", "-"]
+
+# Tokens (compared the same way as NULL_TOKENS) for boolean columns
+TRUE_TOKENS = ["true", "t", "yes", "y"]
+FALSE_TOKENS = ["false", "f", "no", "n"]
+# A column spelled only with single letters is boolean only for these pairs
+BOOLEAN_LETTER_PAIRS = [{"t", "f"}, {"y", "n"}]
+# A column with more distinct values than this cannot be boolean
+MAX_BOOLEAN_DISTINCT = 3 * len(TRUE_TOKENS + FALSE_TOKENS)
+
+# Plain numbers, or numbers with well-formed thousands separators ("1,234.50").
+# The integer part is "0" or starts with 1-9, so leading zeros ("00123") never match
+NUMBER_PATTERN = r"[-+]?(?:0|[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*)(?:\.\d+)?"
+# Significant digits a float64 is guaranteed to keep exactly
+FLOAT_SAFE_DIGITS = 15
+
+# Joins distinct values so trimming, null-token and number checks run as a
+# few C-level string passes. Columns whose values contain it take the slower
+# per-value path instead
+VALUE_SEPARATOR = "\x00"
+# Whitespace right after a separator; searched in the reversed string as well
+# to find whitespace right before one
+PADDING_PATTERN = re.compile(f"{VALUE_SEPARATOR}\\s")
+# A null token between two separators; matched against the lowercased string
+NULL_TOKEN_PATTERN = re.compile(f"{VALUE_SEPARATOR}(?:{'|'.join(map(re.escape, NULL_TOKENS))}){VALUE_SEPARATOR}")
+# Separator-joined numbers, matched in one pass over a whole column. The
+# repeat is possessive: giving back a whole number never helps a fullmatch
+NUMBERS_PATTERN = re.compile(f"{NUMBER_PATTERN}(?:{VALUE_SEPARATOR}{NUMBER_PATTERN})*+")
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def dedupe_column_names(columns: list) -> list:
+    """
+    Sanitize column names and make them unique and Postgres-safe.
+
+    Args:
+        columns: The original column names
+
+    Returns:
+        Sanitized column names; empty names become column_<n> and repeated
+        names get a numeric suffix (total, total_2, total_3, ...)
+    """
+    result = []
+    seen = set()
+    for position, col in enumerate(columns, start=1):
+        base = sanitize_string(str(col), to_lowercase=True) or f"column_{position}"
+        base = base[:MAX_IDENTIFIER_LENGTH]
+        name = base
+        suffix = 2
+        while name in seen:
+            tail = f"_{suffix}"
+            name = f"{base[:MAX_IDENTIFIER_LENGTH - len(tail)]}{tail}"
+            suffix += 1
+        seen.add(name)
+        result.append(name)
+    return result
+
+def _is_boolean(tokens) -> bool:
+    """
+    Check whether lowercased distinct values read as a true/false column.
+
+    Every value must be a boolean token, at least one must be true and one
+    false, and single letters must come as a pair (t/f or y/n).
+    """
+    tokens = set(tokens)
+    if not (tokens <= set(TRUE_TOKENS + FALSE_TOKENS) and tokens & set(TRUE_TOKENS) and tokens & set(FALSE_TOKENS)):
+        return False
+    if all(len(token) == 1 for token in tokens):
+        return any(tokens <= pair for pair in BOOLEAN_LETTER_PAIRS)
+    return True
+
+def _clean_joined(values: pd.Series, trim: bool, normalize_nulls: bool) -> tuple[pd.Series, pd.Series, bool] | None:
+    """
+    Trim distinct string values and flag null tokens with whole-column string
+    passes over the values joined by VALUE_SEPARATOR.
+
+    Returns:
+        The trimmed values, a mask of null tokens and whether trimming changed
+        anything, or None when a value contains VALUE_SEPARATOR
+    """
+    strings = values.tolist()
+    joined = f"{VALUE_SEPARATOR}{VALUE_SEPARATOR.join(strings)}{VALUE_SEPARATOR}"
+    if joined.count(VALUE_SEPARATOR) != len(strings) + 1:
+        return None
+    changed = False
+    if trim and (PADDING_PATTERN.search(joined) or PADDING_PATTERN.search(joined[::-1])):
+        strings = list(map(str.strip, strings))
+        joined = f"{VALUE_SEPARATOR}{VALUE_SEPARATOR.join(strings)}{VALUE_SEPARATOR}"
+        values = pd.Series(strings, dtype=object)
+        changed = True
+    null_mask = pd.Series(False, index=values.index)
+    if normalize_nulls:
+        lowered = joined.lower()
+        if NULL_TOKEN_PATTERN.search(lowered):
+            null_mask = pd.Series(lowered[1:-1].split(VALUE_SEPARATOR)).isin(NULL_TOKENS)
+    return values, null_mask, changed
+
+def _clean_each(values: pd.Series, trim: bool, normalize_nulls: bool) -> tuple[pd.Series, pd.Series, bool]:
+    """
+    Trim distinct values and flag null tokens one value at a time; used for
+    mixed columns, whose non-string values are kept as-is.
+
+    Returns:
+        The trimmed values, a mask of null tokens and whether trimming changed
+        anything
+    """
+    changed = False
+    if trim:
+        stripped = values.str.strip()
+        # .str returns NaN for non-string cells (e.g. Excel dates)
+        stripped = stripped.where(stripped.notna(), values)
+        changed = not stripped.equals(values)
+        values = stripped
+    null_mask = pd.Series(False, index=values.index)
+    if normalize_nulls:
+        null_mask = values.str.lower().isin(NULL_TOKENS)
+    return values, null_mask, changed
+
+def _parse_numbers(values: pd.Series) -> pd.Series | None:
+    """
+    Parse non-null distinct number strings such as "1,234.50".
+
+    Returns None, keeping the column as text, when any value is not a plain
+    number (decimal commas, "1_000", "inf"), when any value has a leading
+    zero ("00123"), when an integer does not fit in 64 bits, or when a
+    decimal has more than FLOAT_SAFE_DIGITS significant digits.
+    """
+    joined = VALUE_SEPARATOR.join(values.tolist())
+    # One strict pass before any cast; this also rejects leading zeros
+    if not NUMBERS_PATTERN.fullmatch(joined):
+        return None
+    compact = joined.replace(",", "")
+    numbers = compact.split(VALUE_SEPARATOR)
+    if "." not in compact:
+        try:
+            # Nullable integers keep ids beyond float precision exact
+            return pd.Series(numbers, index=values.index, dtype=object).astype("Int64")
+        except OverflowError:
+            return None
+    for number in numbers:
+        # Only long numbers can exceed the limit; leading zeros, even after
+        # the point ("0.00123"), are not significant
+        if len(number) > FLOAT_SAFE_DIGITS and len(number.lstrip("+-0.").replace(".", "")) > FLOAT_SAFE_DIGITS:
+            return None
+    return pd.Series(numbers, index=values.index, dtype=object).astype("float64")
+
+def clean_dataframe(
+    df: pd.DataFrame,
+    trim: bool = True,
+    normalize_nulls: bool = True,
+    coerce_numeric: bool = True,
+    coerce_boolean: bool = True,
+    drop_duplicate_rows: bool = False,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Clean parsed values column by column using vectorized pandas operations.
+
+    Only text (object) columns are touched. Each one is factorized, so every
+    check and string operation runs once per distinct value instead of once
+    per row, and a column that needs nothing is left as it was. A column is
+    converted to a numeric or boolean dtype only when every non-null value
+    converts, so mixed columns stay text. Numbers with leading zeros (zip
+    codes, ids) are kept as text.
+
+    Args:
+        df: The DataFrame (or chunk) to clean
+        trim: Strip surrounding whitespace from strings
+        normalize_nulls: Replace NULL_TOKENS such as "", "N/A" and "null" with nulls
+        coerce_numeric: Convert columns like "1,234.50" to numbers
+        coerce_boolean: Convert columns of true/false, yes/no, ... to booleans
+        drop_duplicate_rows: Drop rows that are exact duplicates
+
+    Returns:
+        The cleaned DataFrame and a dict of cleaning statistics
+    """
+    stats = {
+        "nulls_normalized": 0,
+        "numeric_columns": [],
+        "boolean_columns": [],
+        "duplicate_rows_dropped": 0,
+    }
+    # Shallow copy so replacing columns never mutates the caller's frame
+    df = df.copy(deep=False)
+
+    for col in df.columns[df.dtypes == object]:
+        series = df[col]
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred not in ("string", "mixed", "mixed-integer"):
+            continue
+
+        # codes maps every row to its distinct value; missing rows get -1 and
+        # uniques never contains a null
+        codes, uniques = pd.factorize(series)
+        values = pd.Series(uniques, dtype=object)
+        # Mixed columns (e.g. Excel text next to dates) and values containing
+        # VALUE_SEPARATOR go value by value and are never converted
+        cleaned = _clean_joined(values, trim, normalize_nulls) if inferred == "string" else None
+        convertible = cleaned is not None
+        values, null_mask, changed = cleaned or _clean_each(values, trim, normalize_nulls)
+
+        if null_mask.any():
+            null_codes = null_mask.index[null_mask]
+            stats["nulls_normalized"] += int(pd.Series(codes).isin(null_codes).sum())
+            values = values.mask(null_mask)
+            changed = True
+
+        converted = values
+        present = values[~null_mask]
+        if coerce_boolean and convertible and len(present) <= MAX_BOOLEAN_DISTINCT and _is_boolean(present.str.lower()):
+            converted = values.str.lower().isin(TRUE_TOKENS).astype("boolean").mask(null_mask)
+            stats["boolean_columns"].append(col)
+        elif coerce_numeric and convertible:
+            numeric = _parse_numbers(present)
+            if numeric is not None:
+                converted = numeric.reindex(values.index)
+                stats["numeric_columns"].append(col)
+
+        if converted is values and not changed:
+            continue
+        # Expand the distinct values back to rows; -1 codes pick the appended null
+        lookup = pd.concat([converted, pd.Series([None], dtype=converted.dtype)], ignore_index=True)
+        df[col] = pd.Series(lookup.array.take(codes), index=series.index, name=col)
+
+    if drop_duplicate_rows:
+        rows_before = len(df)
+        df = df.drop_duplicates(ignore_index=True)
+        stats["duplicate_rows_dropped"] = rows_before - len(df)
+
+    return df, stats
+
 # Database connection function
 def get_db_connection():
     """Create and return a database connection"""
@@ -81,17 +335,80 @@ def get_sqlalchemy_engine():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"SQLAlchemy engine creation failed: {str(e)}")
 
+# Generated raw table names: raw_<sanitized file name>_<YYYYMMDD_HHMMSS>
+RAW_TABLE_PATTERN = r"^raw_[a-z0-9_]*_\d{8}_\d{6}$"
+
+# Set once ensure_raw_schema has succeeded in this process
+raw_schema_ready = False
+
 # Create raw schema if it doesn't exist
 def ensure_raw_schema():
-    """Ensure the raw schema exists in the database"""
+    """
+    Ensure the raw schema and the ingestion catalog exist in the database.
+
+    Runs at startup; later calls return immediately unless startup failed.
+    When the catalog is first created, existing raw_* tables are backfilled
+    into it so they can be listed and expire under the retention policy.
+    """
+    global raw_schema_ready
+    if raw_schema_ready:
+        return
     connection = get_db_connection()
     cursor = connection.cursor()
     
     try:
         # Create raw schema if it doesn't exist
         cursor.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+        cursor.execute("SELECT to_regclass('raw.ingestion_catalog');")
+        catalog_exists = cursor.fetchone()[0] is not None
+        # One catalog row per ingestion, so listing never has to scan information_schema
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS raw.ingestion_catalog (
+                id BIGSERIAL PRIMARY KEY,
+                source_path TEXT,
+                file_name TEXT NOT NULL,
+                table_name TEXT,
+                row_count BIGINT,
+                column_count INTEGER,
+                file_size_bytes BIGINT,
+                stage_durations JSONB NOT NULL DEFAULT '{}'::jsonb,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                dropped_at TIMESTAMPTZ
+            );
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingestion_catalog_source ON raw.ingestion_catalog(source_path, created_at DESC);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingestion_catalog_created_at ON raw.ingestion_catalog(created_at DESC);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingestion_catalog_table_name ON raw.ingestion_catalog(table_name);")
+        if not catalog_exists:
+            # One-time backfill of tables loaded before the catalog existed; the
+            # source path is unknown and created_at comes from the name suffix
+            cursor.execute(
+                r"""
+                INSERT INTO raw.ingestion_catalog (source_path, file_name, table_name, column_count, status, created_at)
+                SELECT
+                    NULL,
+                    substring(t.table_name from '^raw_(.*)_\d{8}_\d{6}$'),
+                    t.table_name,
+                    (SELECT count(*) FROM information_schema.columns c
+                     WHERE c.table_schema = 'raw' AND c.table_name = t.table_name),
+                    'backfilled',
+                    to_timestamp(substring(t.table_name from '(\d{8}_\d{6})$'), 'YYYYMMDD_HH24MISS')
+                FROM information_schema.tables t
+                WHERE t.table_schema = 'raw'
+                  AND t.table_name ~ %s
+                  AND NOT EXISTS (
+                      SELECT 1 FROM raw.ingestion_catalog existing
+                      WHERE existing.table_name = t.table_name
+                  );
+                """,
+                (RAW_TABLE_PATTERN,)
+            )
+            logfire.info("Existing raw tables backfilled into ingestion catalog", tables=cursor.rowcount)
         connection.commit()
-        logfire.info("Raw schema created/verified successfully")
+        raw_schema_ready = True
+        logfire.info("Raw schema and ingestion catalog created/verified successfully")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error ensuring raw schema: {e}")
     finally:
@@ -99,6 +416,134 @@ def ensure_raw_schema():
         connection.close()
         logfire.info("Database connection closed")
 
+# Columns returned by GET /api/ingestions
+INGESTION_CATALOG_COLUMNS = [
+    "id", "source_path", "file_name", "table_name", "row_count", "column_count",
+    "file_size_bytes", "stage_durations", "status", "error", "created_at", "dropped_at",
+]
+
+def record_ingestion(
+    source_path: str,
+    file_name: str,
+    status: str,
+    table_name: str | None = None,
+    row_count: int | None = None,
+    column_count: int | None = None,
+    file_size_bytes: int | None = None,
+    stage_durations: dict | None = None,
+    error: str | None = None,
+) -> int | None:
+    """
+    Write one row to the ingestion catalog.
+
+    Errors are logged instead of raised so a catalog problem never hides the
+    outcome of the ingestion itself.
+
+    Args:
+        source_path: Path of the file in the raw storage bucket
+        file_name: Name of the uploaded file
+        status: completed, partial or failed
+        table_name: Table the file was loaded into, if one was generated
+        row_count: Rows written to the table
+        column_count: Columns in the table
+        file_size_bytes: Size of the downloaded file
+        stage_durations: Seconds spent in each processing stage
+        error: Error message for failed ingestions
+
+    Returns:
+        The id of the catalog row, or None if it could not be written
+    """
+    try:
+        connection = get_db_connection()
+    except HTTPException as e:
+        logfire.error("Ingestion catalog write failed", source_path=source_path, error=e.detail)
+        return None
+    cursor = connection.cursor()
+
+    try:
+        cursor.execute(
+            """
+            INSERT INTO raw.ingestion_catalog
+                (source_path, file_name, table_name, row_count, column_count,
+                 file_size_bytes, stage_durations, status, error)
+            VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s)
+            RETURNING id;
+            """,
+            (source_path, file_name, table_name, row_count, column_count,
+             file_size_bytes, json.dumps(stage_durations or {}), status, error)
+        )
+        ingestion_id = cursor.fetchone()[0]
+        connection.commit()
+        logfire.info("Ingestion recorded in catalog", ingestion_id=ingestion_id, table_name=table_name, status=status)
+        return ingestion_id
+    except Exception as e:
+        logfire.error("Ingestion catalog write failed", source_path=source_path, error=str(e))
+        return None
+    finally:
+        cursor.close()
+        connection.close()
+        logfire.info("Database connection closed")
+
+def drop_expired_ingestions(retention_days: int) -> list[str]:
+    """
+    Drop raw tables whose ingestion is older than the retention policy.
+
+    Table names are not unique across ingestions (two uploads of a file in
+    the same second share one), so a table is only dropped through its
+    newest catalog row, and every row pointing at it is marked as dropped in
+    the same transaction. Only names matching RAW_TABLE_PATTERN are dropped.
+
+    Args:
+        retention_days: Maximum age in days of a raw table
+
+    Returns:
+        Names of the dropped tables
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+
+    try:
+        cursor.execute(
+            """
+            SELECT c.id, c.table_name
+            FROM raw.ingestion_catalog c
+            WHERE c.table_name IS NOT NULL
+              AND c.dropped_at IS NULL
+              AND c.created_at < now() - %s * interval '1 day'
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM raw.ingestion_catalog newer
+                  WHERE newer.table_name = c.table_name
+                    AND newer.dropped_at IS NULL
+                    AND newer.created_at > c.created_at
+              )
+            ORDER BY c.created_at;
+            """,
+            (retention_days,)
+        )
+        expired = cursor.fetchall()
+        dropped_tables = []
+        for ingestion_id, table_name in expired:
+            if not re.fullmatch(RAW_TABLE_PATTERN, table_name):
+                logfire.warning("Skipping expired ingestion with unexpected table name", table_name=table_name, ingestion_id=ingestion_id)
+                continue
+            quoted_name = table_name.replace('"', '""')
+            cursor.execute(f'DROP TABLE IF EXISTS raw."{quoted_name}";')
+            cursor.execute(
+                "UPDATE raw.ingestion_catalog SET status = 'dropped', dropped_at = now() WHERE table_name = %s AND dropped_at IS NULL;",
+                (table_name,)
+            )
+            connection.commit()
+            dropped_tables.append(table_name)
+            logfire.info("Expired raw table dropped", table_name=table_name, ingestion_id=ingestion_id)
+        return dropped_tables
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error dropping expired tables: {e}")
+    finally:
+        cursor.close()
+        connection.close()
+        logfire.info("Database connection closed")
+
 @app.get("/")
 async def root():
     response_data = {"message": "Hello from Reflexity Backend!"}
@@ -166,12 +611,105 @@ async def upload_webhook(request: Request):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error: {e}")
 
+@app.get("/api/ingestions")
+async def list_ingestions(
+    source: str | None = None,
+    status: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """
+    List ingestions from the catalog, newest first
+    """
+    filters = []
+    params = []
+    if source:
+        filters.append("source_path = %s")
+        params.append(source)
+    if status:
+        filters.append("status = %s")
+        params.append(status)
+    if since:
+        filters.append("created_at >= %s")
+        params.append(since)
+    if until:
+        filters.append("created_at < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    ensure_raw_schema()
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"""
+            SELECT {', '.join(INGESTION_CATALOG_COLUMNS)}
+            FROM raw.ingestion_catalog
+            {where}
+            ORDER BY created_at DESC
+            LIMIT %s OFFSET %s;
+            """,
+            (*params, limit, offset)
+        )
+        ingestions = [dict(zip(INGESTION_CATALOG_COLUMNS, row)) for row in cursor.fetchall()]
+        logfire.info("Ingestions listed", count=len(ingestions), source=source, status=status)
+        return {"ingestions": ingestions, "limit": limit, "offset": offset}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing ingestions: {e}")
+    finally:
+        cursor.close()
+        connection.close()
+        logfire.info("Database connection closed")
+
+@app.post("/api/ingestions/retention")
+async def run_ingestion_retention(x_retention_token: str | None = Header(None)):
+    """
+    Drop raw tables older than INGESTION_RETENTION_DAYS; meant to be called on a
+    schedule with the INGESTION_RETENTION_TOKEN secret in the X-Retention-Token header
+    """
+    expected_token = os.getenv("INGESTION_RETENTION_TOKEN")
+    if not expected_token:
+        raise HTTPException(status_code=500, detail="Retention endpoint not configured (INGESTION_RETENTION_TOKEN)")
+    if not x_retention_token or not secrets.compare_digest(x_retention_token.encode(), expected_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid retention token")
+
+    retention_days = os.getenv("INGESTION_RETENTION_DAYS")
+    if not retention_days:
+        raise HTTPException(status_code=500, detail="Retention policy not configured (INGESTION_RETENTION_DAYS)")
+    try:
+        retention_days = int(retention_days)
+    except ValueError:
+        raise HTTPException(status_code=500, detail=f"Invalid INGESTION_RETENTION_DAYS: {retention_days}")
+    if retention_days <= 0:
+        raise HTTPException(status_code=500, detail=f"INGESTION_RETENTION_DAYS must be positive, got {retention_days}")
+
+    ensure_raw_schema()
+    with logfire.span("ingestion_retention", retention_days=retention_days):
+        dropped_tables = drop_expired_ingestions(retention_days)
+    response_data = {
+        "message": "Retention completed",
+        "retention_days": retention_days,
+        "dropped_tables": dropped_tables
+    }
+    logfire.info("Ingestion retention completed", response_data=response_data)
+    return response_data
+
 async def process_uploaded_file(file_name: str, file_path: str) -> dict:
     """
     Process uploaded file from Supabase storage similar to ingest_file function
     """
     with logfire.span("file_processing", file_name=file_name, file_path=file_path):
+        # Tracked for the ingestion catalog, which is written on success and failure
+        table_name = None
+        file_size = None
+        stage_durations = {}
         try:
+            # No-op unless the startup schema setup failed; runs first so every
+            # later failure can still be cataloged
+            ensure_raw_schema()
+
             # Step 1: Validate file
             if not file_name:
                 raise HTTPException(status_code=400, detail="No file name provided")
@@ -187,11 +725,14 @@ async def process_uploaded_file(file_name: str, file_path: str) -> dict:
             supabase = get_supabase_client()
             
             # Download the file from storage
+            stage_started = time.perf_counter()
             file_content = supabase.storage.from_("raw").download(file_path)
             file_size = len(file_content)
+            stage_durations["download"] = round(time.perf_counter() - stage_started, 3)
             logfire.info("File downloaded", file_size_bytes=file_size,file_size_mb=round(file_size / 1024 / 1024, 2))
             
             # Step 3: Parse file
+            stage_started = time.perf_counter()
             file_buffer = io.BytesIO(file_content)
             if file_extension == 'csv':
                 df = pd.read_csv(file_buffer)
@@ -202,30 +743,45 @@ async def process_uploaded_file(file_name: str, file_path: str) -> dict:
                     status_code=400, 
                     detail="Unsupported file type. Please upload CSV or Excel files only."
                 )
+            stage_durations["parse"] = round(time.perf_counter() - stage_started, 3)
             logfire.info("File parsed successfully", rows=len(df),columns=len(df.columns),column_names=list(df.columns))
             
-            # Step 4: Ensure schema exists
-            ensure_raw_schema()
-            
-            # Step 5: Generate table name
+            # Step 4: Generate table name
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename_with_ext = file_name.split('/')[-1]
-            safe_filename = sanitize_string(filename_with_ext)        
+            # Cap the filename so Postgres never truncates the timestamp suffix away
+            max_filename_length = MAX_IDENTIFIER_LENGTH - len(f"raw__{timestamp}")
+            safe_filename = sanitize_string(filename_with_ext)[:max_filename_length].rstrip('_')
             table_name = f"raw_{safe_filename}_{timestamp}"
             logfire.info("Table name generated", table_name=table_name,timestamp=timestamp,safe_filename=safe_filename)
             
-            # Step 6: Clean column names
+            # Step 5: Clean column names
             original_columns = list(df.columns)
-            df.columns = [sanitize_string(col, to_lowercase=True) for col in df.columns]
+            df.columns = dedupe_column_names(df.columns)
             cleaned_columns = list(df.columns)
             logfire.info("Column names cleaned", original_columns=original_columns,cleaned_columns=cleaned_columns)
-            
-            # Step 7: Bulk database operations using SQLAlchemy
+
+            # Step 5b: Clean values (each step can be switched off with a CLEAN_* env var)
+            stage_started = time.perf_counter()
+            with logfire.span("data_cleaning", table_name=table_name):
+                df, cleaning_stats = clean_dataframe(
+                    df,
+                    trim=env_flag("CLEAN_TRIM", True),
+                    normalize_nulls=env_flag("CLEAN_NORMALIZE_NULLS", True),
+                    coerce_numeric=env_flag("CLEAN_COERCE_NUMERIC", True),
+                    coerce_boolean=env_flag("CLEAN_COERCE_BOOLEAN", True),
+                    drop_duplicate_rows=env_flag("CLEAN_DROP_DUPLICATE_ROWS", False),
+                )
+            stage_durations["clean"] = round(time.perf_counter() - stage_started, 3)
+            logfire.info("Values cleaned", rows=len(df), **cleaning_stats)
+
+            # Step 6: Bulk database operations using SQLAlchemy
             engine = get_sqlalchemy_engine()
             
             try:
-                # Step 7a: Bulk insert using pandas to_sql
+                # Step 6a: Bulk insert using pandas to_sql
                 logfire.info("Starting bulk insert", table_name=table_name,rows_to_insert=len(df),chunk_size=1000)
+                stage_started = time.perf_counter()
                 result = df.to_sql(
                     name=table_name,
                     con=engine,
@@ -235,10 +791,11 @@ async def process_uploaded_file(file_name: str, file_path: str) -> dict:
                     method='multi',
                     chunksize=1000
                 )
+                stage_durations["load"] = round(time.perf_counter() - stage_started, 3)
                 logfire.info("Bulk insert completed", table_name=table_name,rows_inserted=result)
 
 
-                # Step 7b: Verify the data
+                # Step 6b: Verify the data
                 if result == len(df):
                     logfire.info("File processed successfully", table_name=table_name, rows_processed=result)
                 elif result != 0:
@@ -246,14 +803,29 @@ async def process_uploaded_file(file_name: str, file_path: str) -> dict:
                 else:
                     raise HTTPException(status_code=500, detail=f"File {file_name} processing failed. Table: {table_name}")
                 
+                # Step 7: Record the ingestion in the catalog
+                ingestion_id = record_ingestion(
+                    source_path=file_path,
+                    file_name=file_name,
+                    status="completed" if result == len(df) else "partial",
+                    table_name=table_name,
+                    row_count=result,
+                    column_count=len(df.columns),
+                    file_size_bytes=file_size,
+                    stage_durations=stage_durations
+                )
+
                 # Step 8: Return success response
                 response_data = {
+                    "ingestion_id": ingestion_id,
                     "message": "File ingested successfully",
                     "table_name": table_name,
                     "rows_processed": len(df),
                     "columns": list(df.columns),
+                    "cleaning": cleaning_stats,
                     "file_name": file_name,
                     "verified_rows": result,
+                    "stage_durations": stage_durations,
                     "source": "webhook"
                 }
                 
@@ -267,6 +839,15 @@ async def process_uploaded_file(file_name: str, file_path: str) -> dict:
                 logfire.info("Database engine disposed")
                 
         except Exception as e:
+            record_ingestion(
+                source_path=file_path,
+                file_name=file_name,
+                status="failed",
+                table_name=table_name,
+                file_size_bytes=file_size,
+                stage_durations=stage_durations,
+                error=str(e)
+            )
             raise HTTPException(status_code=500, detail=f"File processing failed: {str(e)}")
 
 
@@ -0,0 +1,72 @@
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Run from the repo root: python scratchpad/cleaning_benchmark.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from main import clean_dataframe, dedupe_column_names
+
+ROW_COUNTS = [10_000, 100_000, 300_000, 1_000_000]
+REPEATS = 3
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "data", "retail_sales_dataset.csv")
+
+
+def make_retail_csv(rows: int) -> bytes:
+    """Scale the retail sample up and dirty it the way real uploads are: padding, thousands separators, null tokens, yes/no flags"""
+    rng = np.random.default_rng(42)
+    sample = pd.read_csv(SAMPLE_CSV)
+    df = sample.sample(rows, replace=True, random_state=42).reset_index(drop=True)
+    df["Transaction ID"] = np.arange(rows)
+    df["Customer ID"] = [f"CUST{i:07d}" for i in range(rows)]
+    df["Gender"] = df["Gender"].str.pad(8, side="both")
+    # read_csv already turns "", "N/A" and "null" into NaN, so inject tokens it keeps as text
+    df["Product Category"] = df["Product Category"].mask(rng.random(rows) < 0.05, rng.choice(["-", "nil", " N/A "], rows))
+    df["Total Amount"] = [f"{a:,.2f}" for a in df["Total Amount"]]
+    df["Returned"] = rng.choice(["Yes", "no", "TRUE", "f", "null"], rows)
+    df["total-amount"] = df["Total Amount"]
+    return df.to_csv(index=False).encode()
+
+
+def make_distinct_csv(rows: int) -> bytes:
+    """Worst case: every text value is distinct and needs cleaning"""
+    rng = np.random.default_rng(42)
+    amounts = rng.uniform(0, 100_000, rows)
+    df = pd.DataFrame({
+        "Customer ID": [f"  CUST{i:07d} " for i in range(rows)],
+        "Comment": [f"note {i}" if i % 20 else "nil" for i in range(rows)],
+        "Total Amount": [f"{a:,.2f}" for a in amounts],
+    })
+    return df.to_csv(index=False).encode()
+
+
+def best_of(func, repeats: int = REPEATS) -> float:
+    """Return the fastest wall-clock time of several runs"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+for label, make_csv in [("retail sample", make_retail_csv), ("all distinct", make_distinct_csv)]:
+    print(f"\n{label}")
+    print(f"{'rows':>10} {'parse (s)':>10} {'clean (s)':>10} {'clean/parse':>12} {'+dedup (s)':>11} {'rows/s':>14}")
+    for rows in ROW_COUNTS:
+        content = make_csv(rows)
+        parse_time = best_of(lambda: pd.read_csv(io.BytesIO(content)))
+
+        df = pd.read_csv(io.BytesIO(content))
+        df.columns = dedupe_column_names(df.columns)
+        clean_time = best_of(lambda: clean_dataframe(df))
+        dedup_time = best_of(lambda: clean_dataframe(df, drop_duplicate_rows=True))
+
+        print(f"{rows:>10,} {parse_time:>10.3f} {clean_time:>10.3f} {clean_time / parse_time:>11.1%} {dedup_time:>11.3f} {rows / clean_time:>14,.0f}")
+
+    cleaned, stats = clean_dataframe(df)
+    print("Dtypes:", cleaned.dtypes.astype(str).to_dict())
+    print("Stats:", stats)
@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pandas as pd
+
+# Run from the repo root: python scratchpad/cleaning_checks.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from main import MAX_IDENTIFIER_LENGTH, clean_dataframe, dedupe_column_names
+
+
+def clean_column(values: list, **options) -> tuple[pd.Series, dict]:
+    """Clean a single-column frame and return the column and the stats"""
+    cleaned, stats = clean_dataframe(pd.DataFrame({"col": pd.Series(values, dtype=object)}), **options)
+    return cleaned["col"], stats
+
+
+def as_list(series: pd.Series) -> list:
+    """Column values with every kind of null turned into None"""
+    return [None if pd.isna(value) else value for value in series.astype(object)]
+
+
+# Leading zeros stay text
+col, _ = clean_column(["00123", "00456", "00789"])
+assert col.dtype == object and as_list(col) == ["00123", "00456", "00789"]
+col, _ = clean_column(["0.5", "0", "10"])
+assert col.dtype == "float64"
+
+# Integers that overflow int64 stay text, large ones that fit stay exact
+col, _ = clean_column(["99999999999999999999", "1"])
+assert col.dtype == object
+col, _ = clean_column(["9007199254740993", "1,234"])
+assert str(col.dtype) == "Int64" and as_list(col) == [9007199254740993, 1234]
+
+# Decimals beyond 15 significant digits stay text; leading zeros do not count
+col, _ = clean_column(["1234567890.1234567", "1.5"])
+assert col.dtype == object
+col, _ = clean_column(["0.000123456789012345", "1.5"])
+assert col.dtype == "float64"
+
+# Anything that is not a plain number stays text
+for values in (["1,5", "2,25"], ["1_000", "2"], ["inf", "1"], ["1,23,456", "7"]):
+    col, _ = clean_column(values)
+    assert col.dtype == object, values
+
+# Thousands separators, padding and null tokens together
+col, stats = clean_column([" 1,234.50 ", "N/A", "7", None])
+assert col.dtype == "float64" and as_list(col) == [1234.5, None, 7.0, None]
+assert stats["numeric_columns"] == ["col"] and stats["nulls_normalized"] == 1
+
+# Mixed columns (e.g. Excel text next to dates and numbers) are trimmed but never converted
+stamp = pd.Timestamp("2024-01-01")
+col, _ = clean_column([" a ", stamp, 5, "null"])
+assert as_list(col) == ["a", stamp, 5, None]
+
+# Padding and null tokens are found beyond any sample
+col, _ = clean_column(["x"] * 5001 + [" y "])
+assert col.iloc[-1] == "y"
+col, stats = clean_column(["x"] * 5001 + ["N/A"])
+assert pd.isna(col.iloc[-1]) and stats["nulls_normalized"] == 1
+
+# One null rule everywhere: trimmed and lowercased when trimming, lowercased only when not
+col, stats = clean_column([" N/A ", "Nil", "NONE", "-", "", "value"])
+assert as_list(col) == [None] * 5 + ["value"] and stats["nulls_normalized"] == 5
+col, stats = clean_column([" N/A ", "Nil", "value"], trim=False)
+assert as_list(col) == [" N/A ", None, "value"] and stats["nulls_normalized"] == 1
+col, _ = clean_column([" a ", "NULL"], normalize_nulls=False)
+assert as_list(col) == ["a", "NULL"]
+
+# Booleans need a true and a false token; lone letters only as t/f or y/n pairs
+col, stats = clean_column(["Yes", "no", "TRUE", "f", "null"])
+assert str(col.dtype) == "boolean" and as_list(col) == [True, False, True, False, None]
+assert stats["boolean_columns"] == ["col"]
+col, _ = clean_column(["y", "n", "Y"])
+assert str(col.dtype) == "boolean"
+for values in (["yes", "yes"], ["n", "n", "n"], ["y", "f"], ["t", "n"]):
+    col, _ = clean_column(values)
+    assert col.dtype == object, values
+
+# A column of only null tokens ends up all null and stays text
+col, stats = clean_column(["N/A", " null ", "N/A"])
+assert col.dtype == object and col.isna().all() and stats["nulls_normalized"] == 3
+
+# Values containing the join separator take the per-value path and are never converted
+col, _ = clean_column([" a\x00b ", "nil", "1"])
+assert as_list(col) == ["a\x00b", None, "1"]
+
+# Clean columns and all-null columns are left alone
+frame = pd.DataFrame({"name": ["a", "b"], "empty": pd.Series([None, None], dtype=object)})
+cleaned, stats = clean_dataframe(frame)
+assert cleaned["name"] is frame["name"] or cleaned["name"].equals(frame["name"])
+assert cleaned["empty"].isna().all() and stats["numeric_columns"] == []
+
+# Duplicate rows are dropped only on request
+frame = pd.DataFrame({"a": ["x", "x ", "y"]})
+assert len(clean_dataframe(frame)[0]) == 3
+cleaned, stats = clean_dataframe(frame, drop_duplicate_rows=True)
+assert len(cleaned) == 2 and stats["duplicate_rows_dropped"] == 1
+
+# Column names: collisions get suffixes, empty names get positions, all fit in 63 chars
+assert dedupe_column_names(["Total", "total", "TOTAL!", ""]) == ["total", "total_2", "total_3", "column_4"]
+long_name = "x" * 80
+names = dedupe_column_names([long_name] * 12)
+assert all(len(name) <= MAX_IDENTIFIER_LENGTH for name in names)
+assert len(set(names)) == 12 and names[1].endswith("_2") and names[11].endswith("_12")
+
+print("All cleaning checks passed")